@@ -11,17 +11,43 @@ import argparse
 import json
 import subprocess
 import os
+import shutil
 import sys
 import struct
 import glob
+import itertools
 import urllib.request
 import re
+from concurrent.futures import ThreadPoolExecutor
+from operator import itemgetter
 from urllib.parse import urlparse, unquote
 
+_FILENAME_SANITIZE_RE = re.compile(r'[^\w\-_.]')
+
 
 class DMDFPWMEncoder:
     """DMDFPWM encoder implementation following MDFPWM format specification"""
 
+    # Pan expression used to pull each supported channel out of the 7.1 upmix
+    _PAN_EXPRS = {
+        "FL": "FL",
+        "FR": "FR",
+        "FC": "FC",
+        "LFE": "LFE",
+        # Backs: 10% of front + surround content
+        "BL": "0.1*FL+BL",
+        "BR": "0.1*FR+BR",
+        # Sides: 30% of front + surround content
+        "SL": "0.3*FL+SL",
+        "SR": "0.3*FR+SR",
+    }
+
+    # Header: magic (7 bytes), version (1 byte), payload length (4 bytes, LE),
+    # channel count (2 bytes, LE), chunk size per channel (2 bytes, LE)
+    _HEADER = struct.Struct('<7sBIHH')
+    _METADATA_LEN = struct.Struct('<B')
+    _CHANNEL_CONFIG_LEN = struct.Struct('<H')
+
     def __init__(self):
         self.magic = b"DMDFPWM"
         self.version = 0x01
@@ -29,50 +55,82 @@ class DMDFPWMEncoder:
         self.sample_rate = 48000
         self.bytes_per_second = 6000  # 1 second = 6000 bytes of DFPWM per channel
         self.chunk_size = 6000   # Default chunk size (1 second per channel)
+        self._configs_cache = {}  # config path -> (mtime, parsed config entry)
 
     def find_available_configs(self):
         """Find all available channel configurations in the configs directory"""
         configs = []
 
-        if not os.path.exists(self.configs_dir):
+        # Look for JSON files in the configs directory (skipping hidden files, as *.json would)
+        try:
+            with os.scandir(self.configs_dir) as entries:
+                config_entries = [
+                    entry for entry in entries
+                    if entry.name.endswith('.json') and not entry.name.startswith('.') and entry.is_file()
+                ]
+        except FileNotFoundError:
             print(f"Warning: Configs directory '{self.configs_dir}' not found")
             return configs
 
-        # Look for JSON files in the configs directory
-        config_files = glob.glob(os.path.join(self.configs_dir, "*.json"))
-
-        for config_file in config_files:
+        # Reuse parsed configs that haven't changed since they were last loaded
+        stale_files = []
+        for entry in config_entries:
             try:
-                with open(config_file, 'r') as f:
-                    config_data = json.load(f)
+                mtime = entry.stat().st_mtime
+            except OSError:
+                continue
 
-                # Extract filename without extension for display
-                config_name = os.path.splitext(os.path.basename(config_file))[0]
+            cached = self._configs_cache.get(entry.path)
+            if cached and cached[0] == mtime:
+                configs.append(cached[1])
+            else:
+                stale_files.append((entry.path, mtime))
 
-                # Count channels
-                channel_count = len(config_data) if isinstance(config_data, list) else 0
+        # Read the remaining files concurrently; file I/O releases the GIL so the reads overlap
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            loads = [
+                (config_file, mtime, executor.submit(self.load_config_file, config_file))
+                for config_file, mtime in stale_files
+            ]
 
-                # Get channel names for description
-                channel_names = [ch.get('name', 'Unknown') for ch in config_data]
-                description = f"{config_name} ({channel_count} channels: {', '.join(channel_names)})"
+            for config_file, mtime, load in loads:
+                try:
+                    config_data = load.result()
 
-                configs.append({
-                    'file': config_file,
-                    'name': config_name,
-                    'data': config_data,
-                    'description': description,
-                    'channel_count': channel_count
-                })
+                    # Extract filename without extension for display
+                    config_name = os.path.splitext(os.path.basename(config_file))[0]
 
-            except (json.JSONDecodeError, KeyError) as e:
-                print(f"Warning: Skipping invalid config file '{config_file}': {e}")
-                continue
+                    # Count channels
+                    channel_count = len(config_data) if isinstance(config_data, list) else 0
+
+                    # Get channel names for description
+                    channel_names = [ch.get('name', 'Unknown') for ch in config_data]
+                    description = f"{config_name} ({channel_count} channels: {', '.join(channel_names)})"
+
+                    config = {
+                        'file': config_file,
+                        'name': config_name,
+                        'data': config_data,
+                        'description': description,
+                        'channel_count': channel_count
+                    }
+                    self._configs_cache[config_file] = (mtime, config)
+                    configs.append(config)
+
+                except (json.JSONDecodeError, KeyError) as e:
+                    print(f"Warning: Skipping invalid config file '{config_file}': {e}")
+                    continue
 
         # Sort by channel count, then by name
-        configs.sort(key=lambda x: (x['channel_count'], x['name']))
+        configs.sort(key=itemgetter('channel_count', 'name'))
 
         return configs
 
+    def load_config_file(self, config_file):
+        """Read and parse a single channel configuration file"""
+        with open(config_file, 'r') as f:
+            return json.load(f)
+
     def select_config_interactive(self, available_configs):
         """Present user with interactive config selection"""
         if not available_configs:
@@ -111,16 +169,13 @@ class DMDFPWMEncoder:
                 return None
 
     def is_url(self, path):
-        """Check if a string is a valid URL"""
-        url_pattern = re.compile(
-            r'^https?://'  # http:// or https://
-            r'(?:(?:[A-Z0-9](?:[A-Z0-9-]{0,61}[A-Z0-9])?\.)+[A-Z]{2,6}\.?|'  # domain...
-            r'localhost|'  # localhost...
-            r'\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3})'  # ...or ip
-            r'(?::\d+)?'  # optional port
-            r'(?:/?|[/?]\S+)$', re.IGNORECASE)
+        """Check if a string is an HTTP(S) URL rather than a local path"""
+        try:
+            parsed = urlparse(path)
+        except ValueError:
+            return False
 
-        return url_pattern.match(path) is not None
+        return parsed.scheme in ('http', 'https') and bool(parsed.netloc)
 
     def extract_filename_from_url(self, url):
         """Extract filename from URL, handling Discord CDN and other URLs"""
@@ -158,8 +213,9 @@ class DMDFPWMEncoder:
                 headers={'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'}
             )
             
-            with urllib.request.urlopen(req) as response, open(local_filename, 'wb') as out_file:
-                out_file.write(response.read())
+            # Stream to disk in 1 MiB pieces rather than holding the whole file in memory
+            with urllib.request.urlopen(req, timeout=30) as response, open(local_filename, 'wb') as out_file:
+                shutil.copyfileobj(response, out_file, length=1024 * 1024)
             
             print(f"Downloaded to: {local_filename}")
             return local_filename
@@ -203,9 +259,11 @@ class DMDFPWMEncoder:
         """Get output file name from user and ensure converted/ directory exists"""
         # Create converted directory if it doesn't exist
         converted_dir = "converted"
-        if not os.path.exists(converted_dir):
+        try:
             os.makedirs(converted_dir)
             print(f"Created directory: {converted_dir}")
+        except FileExistsError:
+            pass
 
         while True:
             try:
@@ -216,7 +274,7 @@ class DMDFPWMEncoder:
                     continue
 
                 # Sanitize filename
-                output_name = re.sub(r'[^\w\-_.]', '_', output_name)
+                output_name = _FILENAME_SANITIZE_RE.sub('_', output_name)
                 output_path = os.path.join(converted_dir, f"{output_name}.dmdfpwm")
 
                 print(f"Output file will be: {output_path}")
@@ -270,148 +328,198 @@ class DMDFPWMEncoder:
             raise ValueError("Channel config must be a list")
 
         for i, channel in enumerate(config):
-            required_fields = ['name']
-            for field in required_fields:
-                if field not in channel:
-                    raise ValueError(f"Channel missing required field: {field}")
+            # 'name' is the only required field
+            if 'name' not in channel:
+                raise ValueError(f"Channel {i} missing required field: name")
 
             # Add index based on position if not present
-            if 'index' not in channel:
-                channel['index'] = i
+            channel.setdefault('index', i)
 
         return config
 
+    def serialize_sections(self, artist, title, album, channels):
+        """Serialize the track metadata and channel configuration to their UTF-8 JSON sections"""
+        metadata = {
+            "artist": artist,
+            "title": title,
+            "album": album
+        }
+        metadata_json = json.dumps(metadata).encode('utf-8')
+        channel_config_json = json.dumps(channels).encode('utf-8')
+        return metadata_json, channel_config_json
+
     def build_header(self, channel_count, chunk_size, payload_length):
         """Build DMDFPWM file header"""
-        header = bytearray()
-        header.extend(self.magic)  # Magic: "DMDFPWM"
-        header.append(self.version)  # Version: 0x01
-        header.extend(struct.pack('<I', payload_length))  # Total payload length
-        header.extend(struct.pack('<H', channel_count))  # Channel count
-        header.extend(struct.pack('<H', chunk_size))  # Chunk size per channel
-        return bytes(header)
-
-    def encode_audio(self, input_file, channel_spec):
-        """Encode audio for a specific channel using FFmpeg's built-in DFPWM encoder"""
-        try:
-            channel_idx = channel_spec['index']
-            target_channel = channel_spec['name']
-            channel_filter = channel_spec.get('filter', '')
+        return self._HEADER.pack(self.magic, self.version, payload_length, channel_count, chunk_size)
 
-            # First, create a proper surround upmix, then extract the channel
-            # The surround filter does phase analysis for better channel separation
-            
-            if target_channel == "FL":
-                pan_filter = "surround=chl_out=7.1,pan=mono|c0=FL"
-            elif target_channel == "FR":
-                pan_filter = "surround=chl_out=7.1,pan=mono|c0=FR"
-            elif target_channel == "FC":
-                pan_filter = "surround=chl_out=7.1,pan=mono|c0=FC"
-            elif target_channel == "LFE":
-                pan_filter = "surround=chl_out=7.1,pan=mono|c0=LFE"
-                # Backs: 10% of front + surround content
-            elif target_channel == "BL":
-                pan_filter = "surround=chl_out=7.1,pan=mono|c0=0.1*FL+BL"
-            elif target_channel == "BR":
-                pan_filter = "surround=chl_out=7.1,pan=mono|c0=0.1*FR+BR"
-                # Sides: 30% of front + surround content
-            elif target_channel == "SL":
-                pan_filter = "surround=chl_out=7.1,pan=mono|c0=0.3*FL+SL"
-            elif target_channel == "SR":
-                pan_filter = "surround=chl_out=7.1,pan=mono|c0=0.3*FR+SR"
+    def available_cores(self):
+        """Number of CPU cores this process is allowed to run on"""
+        try:
+            return len(os.sched_getaffinity(0))
+        except AttributeError:
+            # sched_getaffinity is Linux-only
+            return os.cpu_count() or 1
+
+    def build_filter_graph(self, channels):
+        """Build a filter_complex graph that upmixes once and splits out one mono stream per channel"""
+        # The surround filter does phase analysis for better channel separation, and is by far
+        # the most expensive step, so decode and upmix once and split the result per channel
+        split_labels = ''.join(f"[s{i}]" for i in range(len(channels)))
+        graph = [f"[0:a]surround=chl_out=7.1,asplit={len(channels)}{split_labels}"]
+
+        for i, channel in enumerate(channels):
+            # Extract the channel from the surround upmix
+            filters = [f"pan=mono|c0={self._PAN_EXPRS[channel['name']]}"]
+            if channel.get('filter'):
+                filters.append(channel['filter'])
+
+            graph.append(f"[s{i}]{','.join(filters)}[c{i}]")
+
+        return ';'.join(graph)
+
+    def encode_channels(self, input_file, channels):
+        """Encode every channel in a single FFmpeg pass, returning DFPWM data in channel order"""
+        channel_data = [b''] * len(channels)
+
+        # Only channels with a known pan expression go through FFmpeg. The rest stay empty and
+        # interleaving pads them with 0x55 to the length of the others, i.e. silence of the
+        # same duration as the track
+        encoded = []
+        for position, channel in enumerate(channels):
+            if channel['name'] in self._PAN_EXPRS:
+                encoded.append((position, channel))
             else:
-                print(f"  Warning: Unknown channel {target_channel}, using silence")
-                return b'\x55' * 1636771
-
-            # Build filter chain
-            filters = [pan_filter]
-            if channel_filter:
-                filters.append(channel_filter)
-            
-            filter_chain = ','.join(filters)
-
-            cmd = [
-                'ffmpeg', '-y',
-                '-i', input_file,
-                '-filter:a', filter_chain,
+                print(f"  Warning: Unknown channel {channel['name']}, using silence")
+
+        if not encoded:
+            return channel_data
+
+        cmd = [
+            'ffmpeg', '-y',
+            '-i', input_file,
+            # All channels share one graph now, so let it use every core we're allowed to run on
+            '-filter_complex_threads', str(self.available_cores()),
+            '-filter_complex', self.build_filter_graph([channel for _, channel in encoded]),
+        ]
+
+        # One DFPWM output per channel, all fed from the same decode
+        temp_files = []
+        for i, (position, channel) in enumerate(encoded):
+            temp_dfpwm = f"temp_channel_{position}.dfpwm"
+            temp_files.append(temp_dfpwm)
+            cmd.extend([
+                '-map', f"[c{i}]",
                 '-acodec', 'dfpwm',
                 '-ar', '48000',
                 '-ab', '48k',
                 '-ac', '1',
-            ]
-
-            temp_dfpwm = f"temp_channel_{channel_idx}.dfpwm"
-            cmd.append(temp_dfpwm)
+                '-f', 'dfpwm',
+                temp_dfpwm,
+            ])
 
-            result = subprocess.run(cmd, capture_output=True, text=True)
+        try:
+            print("Decoding, upmixing and encoding all channels...")
+            result = subprocess.run(cmd, stdin=subprocess.DEVNULL, capture_output=True)
 
             if result.returncode != 0:
-                raise RuntimeError(f"FFmpeg failed: {result.stderr}")
+                raise RuntimeError(f"FFmpeg failed: {result.stderr.decode('utf-8', errors='replace')}")
 
-            with open(temp_dfpwm, 'rb') as f:
-                dfpwm_data = f.read()
+            for (position, channel), temp_dfpwm in zip(encoded, temp_files):
+                with open(temp_dfpwm, 'rb') as f:
+                    channel_data[position] = f.read()
+                print(f"Encoded channel {channel['index']}: {channel['name']} ({len(channel_data[position])} bytes)")
 
-            os.remove(temp_dfpwm)
+        except Exception as e:
+            print(f"Error encoding channels: {e}")
 
-            return dfpwm_data
+        finally:
+            for temp_dfpwm in temp_files:
+                try:
+                    os.remove(temp_dfpwm)
+                except FileNotFoundError:
+                    pass
 
-        except Exception as e:
-            print(f"Error encoding channel {channel_spec.get('name', 'unknown')}: {e}")
-            return b''
+        return channel_data
 
-    def interleave_audio_chunks(self, channel_data, chunk_size):
-        """Interleave audio data using standard chunking"""
+    def interleave_audio_blocks(self, channel_data, chunk_size, block_size=256 * 1024):
+        """Interleave audio data using standard chunking, yielding blocks of whole frames"""
         if not channel_data:
-            return b''
+            return
 
         # Calculate number of chunks needed
         max_length = max(len(data) for data in channel_data)
         num_chunks = (max_length + chunk_size - 1) // chunk_size
+        frame_size = len(channel_data) * chunk_size
 
-        interleaved = bytearray()
+        # Build the output a few frames (one chunk per channel) at a time so the working set
+        # stays cache-resident instead of striding across the whole payload
+        frames_per_block = max(1, block_size // frame_size)
 
-        for chunk_idx in range(num_chunks):
-            for channel_idx, data in enumerate(channel_data):
-                start = chunk_idx * chunk_size
-                end = min(start + chunk_size, len(data))
-                chunk = data[start:end]
+        sources = [memoryview(data) for data in channel_data]
+        lengths = [len(data) for data in channel_data]
 
-                # Pad with 0x55 if chunk is incomplete
-                if len(chunk) < chunk_size:
-                    chunk = chunk + b'\x55' * (chunk_size - len(chunk))
+        for first_chunk in range(0, num_chunks, frames_per_block):
+            block_chunks = min(frames_per_block, num_chunks - first_chunk)
+            block_start = first_chunk * chunk_size
+            block_end = block_start + block_chunks * chunk_size
 
-                interleaved.extend(chunk)
+            # Channels normally come out of the same pipeline with identical lengths; when every
+            # chunk in the block is full nothing needs padding, so skip the silence fill entirely
+            if all(length >= block_end for length in lengths):
+                block = bytearray(block_chunks * frame_size)
+            else:
+                # Start from all-silence so incomplete chunks come out padded with 0x55
+                block = bytearray(b'\x55') * (block_chunks * frame_size)
+            output = memoryview(block)
+
+            # Copy each channel into its slot of every frame; slice assignment is a plain memcpy
+            for channel_idx, source in enumerate(sources):
+                stop = min(block_end, lengths[channel_idx])
+                if stop <= block_start:
+                    continue
 
-        return bytes(interleaved)
+                full_stop = stop - (stop - block_start) % chunk_size
+                offset = channel_idx * chunk_size
 
-    def write_dmdfpwm(self, output_file, header, artist, title, album, channels, audio_data):
-        """Write complete DMDFPWM file following MDFPWM format specification"""
-        with open(output_file, 'wb') as f:
-            f.write(header)
+                for start in range(block_start, full_stop, chunk_size):
+                    output[offset:offset + chunk_size] = source[start:start + chunk_size]
+                    offset += frame_size
 
-            # Write metadata as JSON object
-            metadata = {
-                "artist": artist,
-                "title": title,
-                "album": album
-            }
-            metadata_json = json.dumps(metadata).encode('utf-8')
-            metadata_len = len(metadata_json)
+                # Partial final chunk; the rest of its slot is already silence
+                if full_stop < stop:
+                    output[offset:offset + stop - full_stop] = source[full_stop:stop]
 
-            # Write metadata length (1 byte) and metadata
-            f.write(bytes([metadata_len]))
-            f.write(metadata_json)
+            yield block
 
-            # Write channel configuration as JSON
-            channel_config_json = json.dumps(channels).encode('utf-8')
-            channel_config_len = len(channel_config_json)
+    def interleaved_length(self, channel_data, chunk_size):
+        """Size in bytes of the interleaved payload, without building it"""
+        if not channel_data:
+            return 0
 
-            # Write channel config length (2 bytes, little-endian) and config data
-            f.write(struct.pack('<H', channel_config_len))
-            f.write(channel_config_json)
+        max_length = max(len(data) for data in channel_data)
+        num_chunks = (max_length + chunk_size - 1) // chunk_size
+        return num_chunks * len(channel_data) * chunk_size
+
+    def write_dmdfpwm(self, output_file, header, metadata_json, channel_config_json, audio_blocks):
+        """Write complete DMDFPWM file from the header and pre-encoded JSON sections, returning its size"""
+        prelude = b''.join((
+            header,
+            # Metadata length (1 byte) and metadata
+            self._METADATA_LEN.pack(len(metadata_json)),
+            metadata_json,
+            # Channel config length (2 bytes, little-endian) and config data
+            self._CHANNEL_CONFIG_LEN.pack(len(channel_config_json)),
+            channel_config_json,
+        ))
+
+        with open(output_file, 'wb', buffering=1024 * 1024) as f:
+            f.write(prelude)
+
+            # Stream the audio payload block by block rather than holding all of it in memory
+            for block in audio_blocks:
+                f.write(block)
 
-            # Write audio payload
-            f.write(audio_data)
+            return f.tell()
 
 def main():
     # Check if any arguments were provided
@@ -487,40 +595,30 @@ def run_interactive():
     print(f"Input: {input_file}")
     print(f"Output: {output_file}")
 
-    # Encode each channel
-    channel_data = []
-    for channel in channels:
-        print(f"Encoding channel {channel['index']}: {channel['name']}")
-        encoded_data = encoder.encode_audio(input_file, channel)
-        channel_data.append(encoded_data)
-        print(f"  Encoded {len(encoded_data)} bytes")
+    # Encode all channels
+    channel_data = encoder.encode_channels(input_file, channels)
 
-    # Interleave audio data using standard chunking
-    interleaved_data = encoder.interleave_audio_chunks(channel_data, chunk_size)
-    print(f"Interleaved {len(interleaved_data)} bytes of audio data")
+    # Size of the interleaved audio; the interleave itself is streamed straight into the file
+    audio_length = encoder.interleaved_length(channel_data, chunk_size)
+    print(f"Interleaving {audio_length} bytes of audio data")
+
+    # Serialize metadata and channel config once; the same bytes size the header and get written
+    metadata_json, channel_config_json = encoder.serialize_sections(artist, title, album, channels)
 
     # Calculate payload length (metadata_len_byte + metadata_json + channel_config_len_bytes + channel_config + audio)
-    metadata = {
-        "artist": artist,
-        "title": title,
-        "album": album
-    }
-    metadata_json = json.dumps(metadata).encode('utf-8')
-    metadata_len = len(metadata_json)
-    channel_config_json = json.dumps(channels).encode('utf-8')
-    channel_config_len = len(channel_config_json)
-    payload_length = 1 + metadata_len + 2 + channel_config_len + len(interleaved_data)
+    payload_length = 1 + len(metadata_json) + 2 + len(channel_config_json) + audio_length
 
     # Build header with correct payload length
     header = encoder.build_header(len(channels), chunk_size, payload_length)
 
     # Write final DMDFPWM file
-    encoder.write_dmdfpwm(output_file, header, artist, title, album, channels, interleaved_data)
+    audio_blocks = encoder.interleave_audio_blocks(channel_data, chunk_size)
+    file_size = encoder.write_dmdfpwm(output_file, header, metadata_json, channel_config_json, audio_blocks)
 
     print("\nStep 6: Complete!")
     print("-" * 16)
     print(f"Created DMDFPWM file: {output_file}")
-    print(f"Total file size: {os.path.getsize(output_file)} bytes")
+    print(f"Total file size: {file_size} bytes")
 
     # Clean up temporary downloaded file
     cleanup_temp_files(input_file)
@@ -609,38 +707,28 @@ def run_command_line():
         cleanup_temp_files(downloaded_file)
         sys.exit(1)
 
-    # Encode each channel
-    channel_data = []
-    for channel in channels:
-        print(f"Encoding channel {channel['index']}: {channel['name']}")
-        encoded_data = encoder.encode_audio(input_file, channel)
-        channel_data.append(encoded_data)
-        print(f"  Encoded {len(encoded_data)} bytes")
+    # Encode all channels
+    channel_data = encoder.encode_channels(input_file, channels)
+
+    # Size of the interleaved audio; the interleave itself is streamed straight into the file
+    audio_length = encoder.interleaved_length(channel_data, args.chunk_size)
+    print(f"Interleaving {audio_length} bytes of audio data")
 
-    # Interleave audio data
-    interleaved_data = encoder.interleave_audio_chunks(channel_data, args.chunk_size)
-    print(f"Interleaved {len(interleaved_data)} bytes of audio data")
+    # Serialize metadata and channel config once; the same bytes size the header and get written
+    metadata_json, channel_config_json = encoder.serialize_sections(artist, title, album, channels)
 
     # Calculate payload length (metadata_len_byte + metadata_json + channel_config_len_bytes + channel_config + audio)
-    metadata = {
-        "artist": artist,
-        "title": title,
-        "album": album
-    }
-    metadata_json = json.dumps(metadata).encode('utf-8')
-    metadata_len = len(metadata_json)
-    channel_config_json = json.dumps(channels).encode('utf-8')
-    channel_config_len = len(channel_config_json)
-    payload_length = 1 + metadata_len + 2 + channel_config_len + len(interleaved_data)
+    payload_length = 1 + len(metadata_json) + 2 + len(channel_config_json) + audio_length
 
     # Build header with correct payload length
     header = encoder.build_header(len(channels), args.chunk_size, payload_length)
 
     # Write final DMDFPWM file
-    encoder.write_dmdfpwm(args.output, header, artist, title, album, channels, interleaved_data)
+    audio_blocks = encoder.interleave_audio_blocks(channel_data, args.chunk_size)
+    file_size = encoder.write_dmdfpwm(args.output, header, metadata_json, channel_config_json, audio_blocks)
 
     print(f"Created DMDFPWM file: {args.output}")
-    print(f"Total file size: {os.path.getsize(args.output)} bytes")
+    print(f"Total file size: {file_size} bytes")
     
     # Clean up downloaded file if it was used
     cleanup_temp_files(downloaded_file)
@@ -648,26 +736,24 @@ def run_command_line():
 
 def cleanup_temp_files(input_file = None):
     """Clean up temporary files"""
-    files_to_cleanup = []
+    files_to_cleanup = itertools.chain(
+        # Clean up downloaded audio file (matches any temp_downloaded_* file)
+        [input_file] if input_file and input_file.startswith("temp_downloaded_") else [],
 
-    # Clean up downloaded audio file (matches any temp_downloaded_* file)
-    if input_file and input_file.startswith("temp_downloaded_") and os.path.exists(input_file):
-        files_to_cleanup.append(input_file)
+        # Clean up any temporary channel files that might be left behind
+        glob.iglob("temp_channel_*.dfpwm"),
 
-    # Clean up any temporary channel files that might be left behind
-    temp_channel_files = glob.glob("temp_channel_*.dfpwm")
-    files_to_cleanup.extend(temp_channel_files)
-    
-    # Clean up any other temp_downloaded files that might be lingering
-    temp_downloaded_files = glob.glob("temp_downloaded_*")
-    files_to_cleanup.extend(temp_downloaded_files)
+        # Clean up any other temp_downloaded files that might be lingering
+        glob.iglob("temp_downloaded_*"),
+    )
 
-    # Remove all identified temp files
+    # Remove all identified temp files; ones already gone are simply skipped
     for temp_file in files_to_cleanup:
         try:
-            if os.path.exists(temp_file):
-                os.remove(temp_file)
-                print(f"Cleaned up temporary file: {temp_file}")
+            os.remove(temp_file)
+            print(f"Cleaned up temporary file: {temp_file}")
+        except FileNotFoundError:
+            pass
         except Exception as e:
             print(f"Warning: Could not remove temp file {temp_file}: {e}")
 